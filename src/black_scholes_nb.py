@@ -0,0 +1,133 @@
+import math
+
+import numba
+import numpy as np
+
+# Numba-compiled Black-Scholes kernels.
+#
+# These price the same model as the SciPy-based reference implementations in
+# black_scholes.py, but fused and compiled to native parallel loops, so the
+# whole formula runs inside one JIT'd kernel instead of chaining norm.cdf
+# and several NumPy temporaries per call.
+
+
+@numba.njit(inline='always', fastmath=True)
+def _ncdf(x):
+    # Normal CDF via the Abramowitz-Stegun 7.1.26 rational approximation of
+    # erf. Max error ~1.5e-7 in erf (~1e-5 in price terms), far below the
+    # 0.01 price tick and the 0.10 arbitrage threshold, and noticeably
+    # cheaper than the exact erf on the hot path.
+    z = abs(x) / math.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * z)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741
+                + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1.0 - poly * math.exp(-z * z)
+    if x < 0.0:
+        return 0.5 * (1.0 - erf)
+    return 0.5 * (1.0 + erf)
+
+
+@numba.njit(parallel=True, fastmath=True)
+def call_pack(S, K, sig_sqrt_t, drift, discount):
+    '''
+    The fair values and deltas of a whole chain of call options paying
+    max(S-K, 0) at expiry, under the Black-Scholes model, computed together
+    in one fused kernel so that d1, d2 and the normal CDF terms are
+    evaluated only once per (timestamp, strike) point.
+
+    The per-timestamp terms that depend only on (T, r, sigma) are taken
+    precomputed, so the kernel spends no sqrt/exp on them.
+
+    Parameters
+    ----------
+    S : ndarray
+        The values of the underlying stock, one per timestamp.
+
+    K : ndarray
+        The strike prices of the options in the chain.
+
+    sig_sqrt_t : ndarray
+        sigma * sqrt(T), one per timestamp.
+
+    drift : ndarray
+        (r + sigma^2 / 2) * T, one per timestamp.
+
+    discount : ndarray
+        exp(-r * T), one per timestamp.
+
+    Returns
+    -------
+    (call_value, call_delta) : tuple of ndarray
+        (n_timestamps, n_strikes) arrays of fair present values and deltas.
+    '''
+
+    n_t = S.shape[0]
+    n_k = K.shape[0]
+    price = np.empty((n_t, n_k), dtype=S.dtype)
+    delta = np.empty((n_t, n_k), dtype=S.dtype)
+    # One prange over the flattened (timestamp, strike) space parallelizes
+    # across strikes as well as timestamps; a strike-only outer loop would
+    # cap the thread count at the handful of strikes in the chain.
+    for idx in numba.prange(n_t * n_k):
+        i = idx // n_k
+        j = idx % n_k
+        d1 = (math.log(S[i] / K[j]) + drift[i]) / sig_sqrt_t[i]
+        d2 = d1 - sig_sqrt_t[i]
+        nd1 = _ncdf(d1)
+        nd2 = _ncdf(d2)
+        price[i, j] = S[i] * nd1 - K[j] * discount[i] * nd2
+        delta[i, j] = nd1
+    return price, delta
+
+
+@numba.njit(parallel=True, fastmath=True)
+def put_pack(S, K, sig_sqrt_t, drift, discount):
+    '''
+    The fair values and deltas of a whole chain of put options paying
+    max(K-S, 0) at expiry, under the Black-Scholes model, computed together
+    in one fused kernel so that d1, d2 and the normal CDF terms are
+    evaluated only once per (timestamp, strike) point.
+
+    The per-timestamp terms that depend only on (T, r, sigma) are taken
+    precomputed, so the kernel spends no sqrt/exp on them.
+
+    Parameters
+    ----------
+    S : ndarray
+        The values of the underlying stock, one per timestamp.
+
+    K : ndarray
+        The strike prices of the options in the chain.
+
+    sig_sqrt_t : ndarray
+        sigma * sqrt(T), one per timestamp.
+
+    drift : ndarray
+        (r + sigma^2 / 2) * T, one per timestamp.
+
+    discount : ndarray
+        exp(-r * T), one per timestamp.
+
+    Returns
+    -------
+    (put_value, put_delta) : tuple of ndarray
+        (n_timestamps, n_strikes) arrays of fair present values and deltas.
+    '''
+
+    n_t = S.shape[0]
+    n_k = K.shape[0]
+    price = np.empty((n_t, n_k), dtype=S.dtype)
+    delta = np.empty((n_t, n_k), dtype=S.dtype)
+    # One prange over the flattened (timestamp, strike) space parallelizes
+    # across strikes as well as timestamps; a strike-only outer loop would
+    # cap the thread count at the handful of strikes in the chain.
+    for idx in numba.prange(n_t * n_k):
+        i = idx // n_k
+        j = idx % n_k
+        d1 = (math.log(S[i] / K[j]) + drift[i]) / sig_sqrt_t[i]
+        d2 = d1 - sig_sqrt_t[i]
+        nd1 = _ncdf(d1)
+        nd2 = _ncdf(d2)
+        price[i, j] = K[j] * discount[i] * (1.0 - nd2) - S[i] * (1.0 - nd1)
+        delta[i, j] = nd1 - 1.0
+    return price, delta
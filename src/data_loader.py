@@ -1,38 +1,86 @@
+import dataclasses
+
+import numpy as np
 import pandas as pd
 
+
+@dataclasses.dataclass
+class MarketPanel:
+    """
+    Preprocessed market data plus metadata derived from its columns.
+
+    Every stage downstream needs the option names and strikes; parsing them
+    out of the MultiIndex once at load time saves each stage rebuilding the
+    same sorted lists from the column tuples.
+
+    Attributes:
+        df (pd.DataFrame): Multi-index DataFrame with stock and options data.
+        option_names (list): Sorted names of all option instruments.
+        call_names (list): Sorted names of the call options.
+        put_names (list): Sorted names of the put options.
+        call_strikes (np.ndarray): Strike prices of the calls, same order.
+        put_strikes (np.ndarray): Strike prices of the puts, same order.
+    """
+    df: pd.DataFrame
+    option_names: list
+    call_names: list
+    put_names: list
+    call_strikes: np.ndarray
+    put_strikes: np.ndarray
+
+
 def load_and_preprocess_data(file_path):
     """
     Reads market data from a CSV and preprocesses it into a structured format.
-    
+
     Args:
         file_path (str): The path to the CSV file.
-        
+
     Returns:
         tuple: A tuple containing:
             - time_to_expiry (pd.DataFrame): DataFrame with time to expiry.
-            - market_data (pd.DataFrame): Multi-index DataFrame with stock and options data.
+            - market_panel (MarketPanel): The market data with its option metadata.
     """
     print("Reading data from:", file_path)
-    df = pd.read_csv(file_path, index_col=0, parse_dates=True)
-    
+    # The pyarrow engine parses the CSV (including the timestamp index) with
+    # multiple threads. We keep the default NumPy-backed dtypes rather than
+    # dtype_backend='pyarrow' because the downstream numba kernels want plain
+    # float64 arrays.
+    df = pd.read_csv(file_path, index_col=0, parse_dates=True, engine='pyarrow')
+
     # 1. Isolate the time to expiry data
     time_to_expiry = df.filter(like='TimeToExpiry')
 
-    # 2. Isolate and structure the stock data
-    stock_df = df.filter(like='-Stock')
-    # We rename the columns to create a MultiIndex: Level 0 = 'Stock', Level 1 = 'BidPrice', etc.
-    stock_df.columns = pd.MultiIndex.from_product([['Stock'], [col.split('-')[0] for col in stock_df.columns]])
-
-    # 3. Isolate and structure the options data
-    options_df = df.drop(columns=stock_df.columns.get_level_values(1) + '-Stock')
-    options_df = options_df.drop(columns=['TimeToExpiry'])
-    # We create a MultiIndex here too: Level 0 = 'C70', Level 1 = 'BidPrice', etc.
-    options_df.columns = pd.MultiIndex.from_tuples(
-        [(col.split('-')[1], col.split('-')[0]) for col in options_df.columns]
+    # 2. Map every 'Field-Instrument' CSV column to its MultiIndex tuple:
+    # Level 0 = 'Stock' or 'C70', Level 1 = 'BidPrice', etc.
+    column_pairs = []
+    for col in df.columns:
+        if col == 'TimeToExpiry':
+            continue
+        field, instrument = col.split('-')
+        column_pairs.append(((instrument, field), col))
+
+    # 3. Sort the tuples upfront and permute the data once, so the frame is
+    # born column-sorted and no sort_index(axis=1) rebuild is needed.
+    column_pairs.sort(key=lambda pair: pair[0])
+    market_data = pd.DataFrame(
+        df[[csv_col for _, csv_col in column_pairs]].to_numpy(),
+        index=df.index,
+        columns=pd.MultiIndex.from_tuples([key for key, _ in column_pairs]),
     )
 
-    # 4. Combine them into a single, clean DataFrame
-    market_data = pd.concat([stock_df, options_df], axis=1).sort_index(axis=1)
+    # 4. Parse the option metadata once so downstream stages can reuse it.
+    option_names = sorted({key[0] for key, _ in column_pairs if key[0] != 'Stock'})
+    call_names = [option for option in option_names if 'C' in option]
+    put_names = [option for option in option_names if 'P' in option]
+    market_panel = MarketPanel(
+        df=market_data,
+        option_names=option_names,
+        call_names=call_names,
+        put_names=put_names,
+        call_strikes=np.array([int(option[1:]) for option in call_names], dtype=np.float64),
+        put_strikes=np.array([int(option[1:]) for option in put_names], dtype=np.float64),
+    )
 
     print("Data loaded and preprocessed successfully.")
-    return time_to_expiry, market_data
\ No newline at end of file
+    return time_to_expiry, market_panel
@@ -9,15 +9,15 @@ def run_backtest():
     """
     print("--- Starting Options Arbitrage Backtest ---")
     
-    time_to_expiry, market_data = data_loader.load_and_preprocess_data(config.DATA_FILE)
-    
+    time_to_expiry, market_panel = data_loader.load_and_preprocess_data(config.DATA_FILE)
+
     market_data_with_models = strategy.calculate_theoretical_values(
-        market_data, time_to_expiry
+        market_panel, time_to_expiry
     )
-    
-    positions = strategy.run_trading_simulation(market_data_with_models)
-    
-    pnl_results = performance.calculate_pnl(positions, market_data)
+
+    positions = strategy.run_trading_simulation(market_data_with_models, market_panel.option_names)
+
+    pnl_results = performance.calculate_pnl(positions, market_panel.df)
 
     print("\n--- Backtest Results ---")
     print(f"Total Realized Cashflow: €{pnl_results['total_cashflow']:.2f}")
@@ -1,26 +1,28 @@
-import pandas as pd
 import numpy as np
 
 def calculate_pnl(positions, market_data):
     print("Calculating PnL...")
     
-    trades_diff = positions.diff().iloc[1:]
-    market_data_for_pnl = market_data.iloc[1:]
-    cashflow_df = pd.DataFrame(index=trades_diff.index)
+    # np.diff produces the (T-1, N) trades directly; DataFrame.diff() would
+    # allocate a full-size frame with a NaN first row only to slice it off.
+    trades = np.diff(positions.to_numpy(), axis=0)
+    # Slicing the arrays is a view; slicing the wide frame with .iloc[1:]
+    # first would copy every column.
+    ask_prices = market_data.xs('AskPrice', axis=1, level=1)[positions.columns].to_numpy()[1:]
+    bid_prices = market_data.xs('BidPrice', axis=1, level=1)[positions.columns].to_numpy()[1:]
 
-    for instrument in positions.columns:
-        instrument_trades = trades_diff[instrument]
-        ask_prices = market_data_for_pnl[(instrument, 'AskPrice')]
-        bid_prices = market_data_for_pnl[(instrument, 'BidPrice')]
-        cashflow_df[instrument] = np.where(instrument_trades >= 0, -instrument_trades * ask_prices, -instrument_trades * bid_prices)
-    total_cashflow = cashflow_df.sum().sum()
+    # Buys lift the ask, sells hit the bid; either way cash flows out on buys.
+    cashflow = np.where(trades >= 0, -trades * ask_prices, -trades * bid_prices)
+    total_cashflow = cashflow.sum()
 
     final_positions = positions.iloc[-1]
     last_market_prices = market_data.iloc[-1]
-    valuation = sum(
-        pos * last_market_prices[(inst, 'BidPrice' if pos > 0 else 'AskPrice')]
-        for inst, pos in final_positions.items() if pos != 0
-    )
+    final_pos = final_positions.to_numpy()
+    last_bids = last_market_prices.xs('BidPrice', level=1)[final_positions.index].to_numpy()
+    last_asks = last_market_prices.xs('AskPrice', level=1)[final_positions.index].to_numpy()
+
+    # Longs are marked at the bid, shorts at the ask; flat positions contribute 0.
+    valuation = float(final_pos @ np.where(final_pos > 0, last_bids, last_asks))
 
     print("PnL calculation complete.")
     return {
@@ -1,9 +1,10 @@
+import numba
 import pandas as pd
-from . import black_scholes as bs 
+from . import black_scholes_nb as bs
 from . import config
 import numpy as np
 
-def calculate_theoretical_values(market_data, time_to_expiry):
+def calculate_theoretical_values(market_panel, time_to_expiry):
     """
     Calculates Black-Scholes values and deltas for all options in the dataset.
 
@@ -11,45 +12,163 @@ def calculate_theoretical_values(market_data, time_to_expiry):
     formulas to entire columns at once instead of looping through each row.
 
     Args:
-        market_data (pd.DataFrame): The preprocessed market data.
+        market_panel (data_loader.MarketPanel): The preprocessed market data
+                                                with its option metadata.
         time_to_expiry (pd.DataFrame): The time to expiry for each timestamp.
 
     Returns:
-        pd.DataFrame: The input market_data DataFrame with new columns for
-                      theoretical prices and deltas.
+        pd.DataFrame: The market data with new columns for theoretical
+                      prices and deltas.
     """
     print("Calculating theoretical option values and deltas...")
-    option_names = sorted(list(set([col[0] for col in market_data.columns if col[0] != 'Stock'])))
-    
-    market_data_calcs = market_data.copy()
-    market_data_calcs['TTE'] = time_to_expiry['TimeToExpiry'].values
-
-    for option in option_names:
-        K = int(option[1:])
-        S_ask, S_bid, T, r, sigma = (
-            market_data_calcs[('Stock', 'AskPrice')], market_data_calcs[('Stock', 'BidPrice')],
-            market_data_calcs['TTE'], config.RISK_FREE_RATE, config.VOLATILITY,
-        )
-
-        if 'C' in option:
-            market_data_calcs[(option, 'Expected AskPrice')] = bs.call_value(S_ask, K, T, r, sigma)
-            market_data_calcs[(option, 'Delta Short')] = -bs.call_delta(S_ask, K, T, r, sigma)
-            market_data_calcs[(option, 'Expected BidPrice')] = bs.call_value(S_bid, K, T, r, sigma)
-            market_data_calcs[(option, 'Delta Long')] = bs.call_delta(S_bid, K, T, r, sigma)
-        elif 'P' in option:
-            market_data_calcs[(option, 'Expected AskPrice')] = bs.put_value(S_bid, K, T, r, sigma)
-            market_data_calcs[(option, 'Delta Short')] = -bs.put_delta(S_bid, K, T, r, sigma)
-            market_data_calcs[(option, 'Expected BidPrice')] = bs.put_value(S_ask, K, T, r, sigma)
-            market_data_calcs[(option, 'Delta Long')] = bs.put_delta(S_ask, K, T, r, sigma)
-
-        market_data_calcs[(option, 'Expected AskPrice')] = round(market_data_calcs[(option, 'Expected AskPrice')], 2)
-        market_data_calcs[(option, 'Expected BidPrice')] = round(market_data_calcs[(option, 'Expected BidPrice')], 2)
-
-    market_data_calcs = market_data_calcs.drop(columns='TTE').sort_index(axis=1)
+    market_data = market_panel.df
+    call_names = market_panel.call_names
+    put_names = market_panel.put_names
+    K_calls = market_panel.call_strikes.astype(np.float32)
+    K_puts = market_panel.put_strikes.astype(np.float32)
+
+    # Single precision is plenty here: the resulting error (~1e-6 in price)
+    # is far below the 0.01 price tick and the arbitrage threshold, and the
+    # narrower arrays halve the kernels' memory traffic.
+    S_ask, S_bid, T, r, sigma = (
+        market_data[('Stock', 'AskPrice')].to_numpy(dtype=np.float32),
+        market_data[('Stock', 'BidPrice')].to_numpy(dtype=np.float32),
+        time_to_expiry['TimeToExpiry'].to_numpy(dtype=np.float32),
+        config.RISK_FREE_RATE, config.VOLATILITY,
+    )
+
+    # The (T, r, sigma)-only terms are shared by every strike and side, so
+    # compute them once per timestamp instead of inside the kernels.
+    sig_sqrt_t = sigma * np.sqrt(T)
+    drift = (r + 0.5 * sigma ** 2) * T
+    discount = np.exp(-r * T)
+
+    # One batched kernel call per (type, side) prices the whole chain at once.
+    call_expected_ask, call_delta_short = bs.call_pack(S_ask, K_calls, sig_sqrt_t, drift, discount)
+    call_expected_bid, call_delta_long = bs.call_pack(S_bid, K_calls, sig_sqrt_t, drift, discount)
+    put_expected_ask, put_delta_short = bs.put_pack(S_bid, K_puts, sig_sqrt_t, drift, discount)
+    put_expected_bid, put_delta_long = bs.put_pack(S_ask, K_puts, sig_sqrt_t, drift, discount)
+
+    # Quote the model prices to the cent in one in-place pass per matrix
+    # (upcast to float64 first), not in a second pass per option column.
+    call_expected_ask = call_expected_ask.astype(np.float64)
+    call_expected_bid = call_expected_bid.astype(np.float64)
+    put_expected_ask = put_expected_ask.astype(np.float64)
+    put_expected_bid = put_expected_bid.astype(np.float64)
+    np.round(call_expected_ask, 2, out=call_expected_ask)
+    np.round(call_expected_bid, 2, out=call_expected_bid)
+    np.round(put_expected_ask, 2, out=put_expected_ask)
+    np.round(put_expected_bid, 2, out=put_expected_bid)
+
+    # Collect every new column in plain NumPy first; inserting them into the
+    # MultiIndex frame one by one would rebuild the column index each time.
+    new_cols = {}
+    for j, option in enumerate(call_names):
+        new_cols[(option, 'Expected AskPrice')] = call_expected_ask[:, j]
+        new_cols[(option, 'Delta Short')] = -call_delta_short[:, j]
+        new_cols[(option, 'Expected BidPrice')] = call_expected_bid[:, j]
+        new_cols[(option, 'Delta Long')] = call_delta_long[:, j]
+
+    for j, option in enumerate(put_names):
+        new_cols[(option, 'Expected AskPrice')] = put_expected_ask[:, j]
+        new_cols[(option, 'Delta Short')] = -put_delta_short[:, j]
+        new_cols[(option, 'Expected BidPrice')] = put_expected_bid[:, j]
+        new_cols[(option, 'Delta Long')] = put_delta_long[:, j]
+
+    # Merge old and new columns in sorted order directly, so the enriched
+    # frame is born column-sorted and needs no sort_index(axis=1) rebuild.
+    all_cols = {col: market_data[col].to_numpy() for col in market_data.columns}
+    all_cols.update(new_cols)
+    market_data_calcs = pd.DataFrame(
+        {col: all_cols[col] for col in sorted(all_cols)}, index=market_data.index
+    )
+    market_data_calcs.columns = pd.MultiIndex.from_tuples(market_data_calcs.columns)
     print("Calculations complete.")
     return market_data_calcs
 
-def run_trading_simulation(market_data_with_models):
+# Field order of the last axis of the panel built by to_panel.
+PANEL_FIELDS = ('AskPrice', 'BidPrice', 'AskVolume', 'BidVolume',
+                'Expected AskPrice', 'Expected BidPrice')
+ASK_PRICE, BID_PRICE, ASK_VOLUME, BID_VOLUME, EXPECTED_ASK, EXPECTED_BID = range(6)
+
+
+def to_panel(market_data_with_models, option_names):
+    """
+    Lifts the per-option market and model columns into a structure-of-arrays
+    NumPy layout for the simulation hot path.
+
+    Reading a MultiIndex DataFrame column-by-tuple goes through a hash lookup
+    per access; a dense panel makes every field a plain array slice instead.
+
+    Args:
+        market_data_with_models (pd.DataFrame): The market data enriched with
+                                                Black-Scholes values and deltas.
+        option_names (list): The option instruments, in column order of the
+                             returned arrays.
+
+    Returns:
+        tuple: A tuple containing:
+            - panel (np.ndarray): (T, N, len(PANEL_FIELDS)) array of prices,
+              volumes and model prices, fields on the contiguous last axis.
+            - delta_short (np.ndarray): (T, N) per-unit deltas for short positions.
+            - delta_long (np.ndarray): (T, N) per-unit deltas for long positions.
+    """
+    n_timestamps = len(market_data_with_models.index)
+    n_options = len(option_names)
+
+    panel = np.empty((n_timestamps, n_options, len(PANEL_FIELDS)))
+    delta_short = np.empty((n_timestamps, n_options))
+    delta_long = np.empty((n_timestamps, n_options))
+    for o, option in enumerate(option_names):
+        for f, field in enumerate(PANEL_FIELDS):
+            panel[:, o, f] = market_data_with_models[(option, field)].to_numpy()
+        delta_short[:, o] = market_data_with_models[(option, 'Delta Short')].to_numpy()
+        delta_long[:, o] = market_data_with_models[(option, 'Delta Long')].to_numpy()
+
+    return panel, delta_short, delta_long
+
+
+@numba.njit(parallel=True)
+def _simulate(panel, delta_short, delta_long, threshold):
+    """
+    Jitted simulation kernel: tracks the running position and delta
+    contribution per option over all timestamps.
+
+    Options are independent of each other, so the outer loop runs in
+    parallel; the inner time loop is sequential because each position is a
+    running sum of its own trades.
+
+    Args:
+        panel (np.ndarray): (T, N, fields) array from to_panel.
+        delta_short (np.ndarray): (T, N) per-unit deltas for short positions.
+        delta_long (np.ndarray): (T, N) per-unit deltas for long positions.
+        threshold (float): Minimum price discrepancy that triggers a trade.
+
+    Returns:
+        tuple: (T, N) arrays of positions and option delta contributions.
+    """
+    n_timestamps, n_options = delta_short.shape
+    positions = np.empty((n_timestamps, n_options))
+    option_deltas = np.empty((n_timestamps, n_options))
+    for o in numba.prange(n_options):
+        position = 0.0
+        for t in range(n_timestamps):
+            # Branchless trade selection: the signal booleans lower to 0/1
+            # multiplies instead of data-dependent jumps. A sell signal takes
+            # precedence over a simultaneous buy signal, as before.
+            sell = panel[t, o, BID_PRICE] - panel[t, o, EXPECTED_ASK] >= threshold
+            buy = panel[t, o, EXPECTED_BID] - panel[t, o, ASK_PRICE] >= threshold
+            trade_volume = (panel[t, o, ASK_VOLUME] * (buy and not sell)
+                            - panel[t, o, BID_VOLUME] * sell)
+            position += trade_volume
+            positions[t, o] = position
+            short = position < 0.0
+            delta_val = delta_short[t, o] * short + delta_long[t, o] * (not short)
+            option_deltas[t, o] = abs(position) * delta_val
+    return positions, option_deltas
+
+
+def run_trading_simulation(market_data_with_models, option_names):
     """
     Simulates the arbitrage strategy and delta hedging over the entire dataset.
 
@@ -60,6 +179,8 @@ def run_trading_simulation(market_data_with_models):
     Args:
         market_data_with_models (pd.DataFrame): The market data enriched with
                                                 Black-Scholes values and deltas.
+        option_names (list): The option instruments, as cached on the
+                             data_loader.MarketPanel.
 
     Returns:
         pd.DataFrame: A DataFrame containing the history of positions for all
@@ -67,56 +188,23 @@ def run_trading_simulation(market_data_with_models):
     """
     print("Running trading simulation...")
     timestamp_index = market_data_with_models.index
-    option_names = sorted(list(set([col[0] for col in market_data_with_models.columns if col[0] != 'Stock'])))
-
-    log_data = {}
-    for option in option_names:
-        if 'C' in option:
-            log_data[('Call Position', option)] = []
-            log_data[('Call Delta', option)] = []
-        if 'P' in option:
-            log_data[('Put Position', option)] = []
-            log_data[('Put Delta', option)] = []
-
-    call_positions = {opt: 0.0 for opt in option_names if 'C' in opt}
-    put_positions = {opt: 0.0 for opt in option_names if 'P' in opt}
-
-    for _, row in market_data_with_models.iterrows():
-        for option in option_names:
-            trade_volume = 0
-            model_ask, model_bid = row[(option, 'Expected AskPrice')], row[(option, 'Expected BidPrice')]
-            market_ask, market_bid = row[(option, 'AskPrice')], row[(option, 'BidPrice')]
-            
-            if market_bid - model_ask >= config.ARBITRAGE_THRESHOLD:
-                trade_volume = -row[(option, 'BidVolume')]
-            elif model_bid - market_ask >= config.ARBITRAGE_THRESHOLD:
-                trade_volume = row[(option, 'AskVolume')]
-            
-            if 'C' in option:
-                call_positions[option] += trade_volume
-                log_data[('Call Position', option)].append(call_positions[option])
-                delta_val = row[(option, 'Delta Short')] if call_positions[option] < 0 else row[(option, 'Delta Long')]
-                log_data[('Call Delta', option)].append(abs(call_positions[option]) * delta_val)
-            elif 'P' in option:
-                put_positions[option] += trade_volume
-                log_data[('Put Position', option)].append(put_positions[option])
-                delta_val = row[(option, 'Delta Short')] if put_positions[option] < 0 else row[(option, 'Delta Long')]
-                log_data[('Put Delta', option)].append(abs(put_positions[option]) * delta_val)
-    
-    trades_df = pd.DataFrame(log_data, index=timestamp_index)
-    trades_df = trades_df.reindex(sorted(trades_df.columns), axis=1)
-
-    call_delta_cols = [col for col in trades_df.columns if col[0] == 'Call Delta']
-    put_delta_cols = [col for col in trades_df.columns if col[0] == 'Put Delta']
-    total_option_delta = trades_df[call_delta_cols].sum(axis=1) + trades_df[put_delta_cols].sum(axis=1)
-    
+
+    panel, delta_short, delta_long = to_panel(market_data_with_models, option_names)
+    positions, option_deltas = _simulate(
+        panel, delta_short, delta_long, config.ARBITRAGE_THRESHOLD
+    )
+
+    # Hedge whole shares against the total option delta, rounding towards zero.
+    total_option_delta = option_deltas.sum(axis=1)
     stock_position = -np.where(total_option_delta >= 0, np.floor(total_option_delta), np.ceil(total_option_delta))
-    
-    final_positions = pd.DataFrame(index=timestamp_index)
-    for option in option_names:
-        pos_key = ('Call Position', option) if 'C' in option else ('Put Position', option)
-        final_positions[option] = trades_df[pos_key]
-    final_positions['Stock'] = stock_position
-    
+
+    # option_names is sorted and 'Stock' sorts after every option name, so
+    # the columns are already in final order; no per-option lookups needed.
+    final_positions = pd.DataFrame(
+        np.column_stack([positions, stock_position]),
+        index=timestamp_index,
+        columns=option_names + ['Stock'],
+    )
+
     print("Simulation complete.")
-    return final_positions.sort_index(axis=1)
\ No newline at end of file
+    return final_positions
\ No newline at end of file